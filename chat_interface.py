@@ -2,33 +2,194 @@
 Interactive chat interface for querying YouTube video transcripts.
 """
 
-from typing import Optional
+import asyncio
+import mmap
+import os
+import sys
+import threading
+from typing import Dict, Iterator, Optional
+
+import orjson
+from prompt_toolkit import PromptSession
+
 from gemini_rag import GeminiRAG
 
 
+_BAR = "=" * 80
+
+# Fixed chat output, built once. The welcome text is filled in with
+# str.format_map when it is shown.
+_WELCOME_TMPL = "\n".join([
+    "",
+    _BAR,
+    "🎬 YouTube Channel RAG Chat - {name}",
+    _BAR,
+    "",
+    "Welcome! Ask me anything about the videos from this channel.",
+    "",
+    "Commands:",
+    "  - Type 'help' for help",
+    "  - Type 'history' to see conversation history",
+    "  - Type 'clear' to clear history",
+    "  - Type 'cache clear' to clear cached answers",
+    "  - Type 'batch: question 1 | question 2' to ask several questions at once",
+    "  - Type 'exit', 'quit', or 'q' to exit",
+    "",
+    _BAR,
+])
+
+_GOODBYE_TEXT = "\n".join([
+    "",
+    _BAR,
+    "👋 Thanks for chatting! Goodbye!",
+    _BAR,
+])
+
+_HELP_TEXT = "\n".join([
+    "",
+    _BAR,
+    "📖 HELP",
+    _BAR,
+    "",
+    "This is a RAG (Retrieval-Augmented Generation) chatbot.",
+    "It uses the video transcripts from the YouTube channel to answer your questions.",
+    "",
+    "Tips:",
+    "  - Ask specific questions about topics covered in the videos",
+    "  - Request summaries or explanations",
+    "  - Ask for comparisons between different videos",
+    "  - Citations show which parts of the transcripts were used",
+    "",
+    "Commands:",
+    "  - help       : Show this help message",
+    "  - history    : View conversation history",
+    "  - clear      : Clear conversation history",
+    "  - cache clear: Clear cached answers",
+    "  - batch: q1 | q2: Ask several questions at once",
+    "  - exit/quit  : Exit the chat",
+    _BAR,
+])
+
+
+async def _in_thread(func, *args):
+    """
+    Run a blocking call in a daemon thread and await its result.
+
+    Unlike asyncio.to_thread, nothing waits for the thread on exit: when
+    the chat is interrupted, asyncio.run does not block on a query that is
+    still running, and the abandoned thread does not hold up the process.
+
+    Args:
+        func: Function to call
+        *args: Positional arguments for func
+
+    Returns:
+        Return value of func
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def deliver(result, error):
+        if future.done():
+            return  # Cancelled while the call was running
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def run():
+        result, error = None, None
+        try:
+            result = func(*args)
+        except Exception as e:
+            error = e
+        try:
+            loop.call_soon_threadsafe(deliver, result, error)
+        except RuntimeError:
+            pass  # Event loop already closed
+
+    threading.Thread(target=run, daemon=True).start()
+    return await future
+
+
 class ChatInterface:
     """Interactive chat interface for RAG queries."""
 
-    def __init__(self, rag: GeminiRAG, channel_name: str = "YouTube Channel"):
+    def __init__(
+        self,
+        rag: GeminiRAG,
+        channel_name: str = "YouTube Channel",
+        history_path: Optional[str] = None,
+    ):
         """
         Initialize the chat interface.
 
         Args:
             rag: GeminiRAG instance with uploaded files
             channel_name: Name of the YouTube channel for display
+            history_path: Append-only file the conversation history is kept in
+                (default: one file per channel under transcripts/)
         """
         self.rag = rag
         self.channel_name = channel_name
-        self.history = []
+
+        if history_path is None:
+            slug = "".join(c if c.isalnum() or c in "-_." else "_" for c in channel_name)
+            history_path = os.path.join("transcripts", f"chat_history_{slug}.bin")
+        os.makedirs(os.path.dirname(history_path) or ".", exist_ok=True)
+        self.history_path = history_path
 
     def start(self):
         """Start the interactive chat session."""
+        try:
+            asyncio.run(self._run())
+        except KeyboardInterrupt:
+            # Interrupted while a query was running
+            print("\n")
+            self._print_goodbye()
+
+    async def _run(self):
+        """
+        Run the chat loop.
+
+        Input is read asynchronously, so while the user is typing a
+        background task keeps the connection to the Gemini API warm.
+        Blocking API calls run in daemon threads (see _in_thread), so
+        Ctrl-C during a query exits right away.
+        """
         self._print_welcome()
 
+        session = PromptSession()
+        keep_warm = asyncio.create_task(self._keep_warm())
+
+        try:
+            await self._chat_loop(session)
+        finally:
+            keep_warm.cancel()
+
+    async def _keep_warm(self, interval: float = 20.0):
+        """
+        Periodically make a cheap API call so the next query does not pay
+        for a new connection.
+
+        Args:
+            interval: Seconds between calls
+        """
+        while True:
+            await asyncio.sleep(interval)
+            await _in_thread(self.rag.keep_alive)
+
+    async def _chat_loop(self, session: PromptSession):
+        """
+        Read and answer questions until the user exits.
+
+        Args:
+            session: Prompt session used to read input
+        """
         while True:
             try:
                 # Get user input
-                question = input("\n💬 You: ").strip()
+                question = (await session.prompt_async("\n💬 You: ")).strip()
 
                 # Check for exit commands
                 if question.lower() in ["exit", "quit", "q", "bye"]:
@@ -49,26 +210,44 @@ class ChatInterface:
                     continue
 
                 if question.lower() == "clear":
-                    self.history = []
+                    self._clear_history()
                     print("✅ History cleared")
                     continue
 
+                if question.lower() == "cache clear":
+                    self.rag.clear_cache()
+                    print("✅ Response cache cleared")
+                    continue
+
+                # Several questions separated by '|' are queried together
+                if question.lower().startswith("batch:"):
+                    questions = [q.strip() for q in question[len("batch:"):].split("|")]
+                    questions = [q for q in questions if q]
+                    if not questions:
+                        continue
+
+                    print(f"\n🤔 Thinking about {len(questions)} questions...", end=" ", flush=True)
+                    results = await _in_thread(self.rag.query_batch, questions)
+                    print("\r", end="")  # Clear the "Thinking..." message
+
+                    for q, result in zip(questions, results):
+                        print(f"\n❓ {q}")
+                        self._display_response(result)
+                        self._add_to_history(q, result)
+                    continue
+
                 # Query the RAG system
                 print("\n🤔 Thinking...", end=" ", flush=True)
-                result = self.rag.query(question)
+                result = await _in_thread(self.rag.query, question)
                 print("\r", end="")  # Clear the "Thinking..." message
 
                 # Display response
                 self._display_response(result)
 
                 # Save to history
-                self.history.append({
-                    "question": question,
-                    "answer": result["answer"],
-                    "citations": result.get("citations", [])
-                })
+                self._add_to_history(question, result)
 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError):
                 print("\n")
                 self._print_goodbye()
                 break
@@ -76,59 +255,99 @@ class ChatInterface:
             except Exception as e:
                 print(f"\n❌ Error: {e}")
 
+    def _add_to_history(self, question: str, result: dict):
+        """
+        Append a question and its result to the history file.
+
+        Entries are stored as a 4-byte little-endian length followed by
+        the JSON-encoded entry, so the file only ever grows at the end.
+
+        Args:
+            question: User's question
+            result: Dictionary with 'answer' and 'citations'
+        """
+        blob = orjson.dumps({
+            "question": question,
+            "answer": result["answer"],
+            "preview": result["answer"][:200],
+            "citations": result.get("citations", [])
+        })
+
+        fd = os.open(self.history_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, len(blob).to_bytes(4, "little") + blob)
+        finally:
+            os.close(fd)
+
+    def _iter_history(self) -> Iterator[Dict]:
+        """
+        Read history entries back from the memory-mapped history file.
+
+        Yields:
+            History entries, oldest first
+        """
+        try:
+            f = open(self.history_path, "rb")
+        except FileNotFoundError:
+            return
+
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                offset = 0
+                while offset + 4 <= len(mm):
+                    size = int.from_bytes(mm[offset:offset + 4], "little")
+                    offset += 4
+                    if offset + size > len(mm):
+                        break  # Incomplete trailing entry
+                    yield orjson.loads(mm[offset:offset + size])
+                    offset += size
+
+    def _clear_history(self):
+        """Remove all entries from the history file."""
+        if os.path.exists(self.history_path):
+            os.truncate(self.history_path, 0)
+
     def _print_welcome(self):
         """Print welcome message."""
-        print("\n" + "=" * 80)
-        print(f"🎬 YouTube Channel RAG Chat - {self.channel_name}")
-        print("=" * 80)
-        print("\nWelcome! Ask me anything about the videos from this channel.")
-        print("\nCommands:")
-        print("  - Type 'help' for help")
-        print("  - Type 'history' to see conversation history")
-        print("  - Type 'clear' to clear history")
-        print("  - Type 'exit', 'quit', or 'q' to exit")
-        print("\n" + "=" * 80)
+        self._write(_WELCOME_TMPL.format_map({"name": self.channel_name}))
 
     def _print_goodbye(self):
         """Print goodbye message."""
-        print("\n" + "=" * 80)
-        print("👋 Thanks for chatting! Goodbye!")
-        print("=" * 80)
+        self._write(_GOODBYE_TEXT)
 
     def _print_help(self):
         """Print help information."""
-        print("\n" + "=" * 80)
-        print("📖 HELP")
-        print("=" * 80)
-        print("\nThis is a RAG (Retrieval-Augmented Generation) chatbot.")
-        print("It uses the video transcripts from the YouTube channel to answer your questions.")
-        print("\nTips:")
-        print("  - Ask specific questions about topics covered in the videos")
-        print("  - Request summaries or explanations")
-        print("  - Ask for comparisons between different videos")
-        print("  - Citations show which parts of the transcripts were used")
-        print("\nCommands:")
-        print("  - help     : Show this help message")
-        print("  - history  : View conversation history")
-        print("  - clear    : Clear conversation history")
-        print("  - exit/quit: Exit the chat")
-        print("=" * 80)
+        self._write(_HELP_TEXT)
 
     def _print_history(self):
         """Print conversation history."""
-        if not self.history:
+        lines = ["", _BAR, "📝 CONVERSATION HISTORY", _BAR]
+        count = 0
+
+        for i, entry in enumerate(self._iter_history(), 1):
+            count = i
+            lines.append(f"\n[{i}] You: {entry['question']}")
+            lines.append(f"    Bot: {entry['preview']}...")
+
+        if not count:
             print("\n📝 No conversation history yet.")
             return
 
-        print("\n" + "=" * 80)
-        print("📝 CONVERSATION HISTORY")
-        print("=" * 80)
+        lines.extend(["", _BAR])
+        self._write("\n".join(lines))
 
-        for i, entry in enumerate(self.history, 1):
-            print(f"\n[{i}] You: {entry['question']}")
-            print(f"    Bot: {entry['answer'][:200]}...")
+    def _write(self, text: str):
+        """
+        Write a block of text to stdout in a single call.
 
-        print("\n" + "=" * 80)
+        Args:
+            text: Text to write (a trailing newline is added)
+        """
+        sys.stdout.write(text + "\n")
+        sys.stdout.flush()
 
     def _display_response(self, result: dict):
         """
@@ -3,14 +3,24 @@ File manager for creating and managing transcript files.
 """
 
 import os
-import re
-from typing import List, Dict
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Tuple
 from pathlib import Path
 
 
+PIPELINE_DEPTH = 8  # Written files that may wait for the consumer at once
+
+_DONE = object()  # Queued after the last written file
+
+
 class FileManager:
     """Manages transcript file creation and storage."""
 
+    # Translation table that drops characters invalid in filenames
+    _INVALID_CHARS = str.maketrans("", "", '<>:"/\\|?*')
+
     def __init__(self, base_dir: str = "transcripts"):
         """
         Initialize the file manager.
@@ -21,36 +31,132 @@ class FileManager:
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(exist_ok=True)
 
-    def create_transcript_files(self, videos: List[Dict[str, str]]) -> List[str]:
+    def create_transcript_files(self, videos: Iterable[Dict[str, str]]) -> List[str]:
         """
         Create individual transcript files for each video.
 
         Args:
-            videos: List of video dictionaries with title, url, and transcript
+            videos: Video dictionaries with title, url, and transcript
 
         Returns:
-            List of file paths created
+            List of file paths created, in the same order as the videos
+        """
+        paths_by_index = dict(self._write_all(videos))
+        return [paths_by_index[i] for i in sorted(paths_by_index)]
+
+    def iter_transcript_files(self, videos: Iterable[Dict[str, str]]) -> Iterator[str]:
+        """
+        Create transcript files, yielding each path as soon as it is written.
+
+        Lets a consumer (e.g. GeminiRAG.upload_files) start on a file while
+        the remaining files are still being written.
+
+        Args:
+            videos: Video dictionaries with title, url, and transcript
+
+        Yields:
+            Paths of created files, in completion order
+        """
+        for _, file_path in self._write_all(videos):
+            yield file_path
+
+    def _write_all(self, videos: Iterable[Dict[str, str]]) -> Iterator[Tuple[int, str]]:
+        """
+        Write transcript files in parallel.
+
+        videos is consumed on a background thread that hands finished files
+        over through a bounded queue, so paths are yielded while later videos
+        are still arriving (e.g. from YouTubeScraper.iter_channel).
+
+        Args:
+            videos: Video dictionaries with title, url, and transcript
+
+        Yields:
+            (1-based video index, file path) pairs as files are written
         """
         print(f"\n📝 Creating transcript files in '{self.base_dir}'...")
 
-        file_paths = []
+        # Finished writes waiting for the consumer; when it falls behind,
+        # writer threads block instead of piling up results
+        finished = queue.Queue(maxsize=PIPELINE_DEPTH)
+        stop = threading.Event()
+
+        producer = threading.Thread(
+            target=self._submit_writes, args=(videos, finished, stop), daemon=True
+        )
+        producer.start()
+        count = 0
+
+        try:
+            while (entry := finished.get()) is not _DONE:
+                index, future = entry
+                file_path = future.result()
+                count += 1
+                print(f"  ✓ Created: {os.path.basename(file_path)}")
+                yield index, file_path
+        finally:
+            # Let the producer finish (or stop early) without blocking on a
+            # full queue, then wait for it
+            stop.set()
+            while entry is not _DONE:
+                entry = finished.get()
+            producer.join()
+
+        print(f"\n✅ Created {count} transcript files")
+
+    def _submit_writes(
+        self,
+        videos: Iterable[Dict[str, str]],
+        finished: "queue.Queue",
+        stop: threading.Event,
+    ):
+        """
+        Submit a write for each video and queue the futures as they complete.
 
-        for i, video in enumerate(videos, 1):
-            # Create safe filename from video title
-            filename = self._sanitize_filename(video["title"])
-            file_path = self.base_dir / f"{i:03d}_{filename}.txt"
+        Runs on the producer thread started by _write_all. _DONE is always
+        queued last, after every submitted write has completed.
 
-            # Create file content with metadata
-            content = self._format_transcript(video)
+        Args:
+            videos: Video dictionaries with title, url, and transcript
+            finished: Queue receiving (index, future) pairs, then _DONE
+            stop: Set when the consumer has stopped reading
+        """
+        # Files are independent, so format and write them in parallel
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for i, video in enumerate(videos, 1):
+                    if stop.is_set():
+                        break
+                    future = executor.submit(self._write_one, i, video)
+                    future.add_done_callback(lambda f, i=i: finished.put((i, f)))
+        except Exception as e:
+            # Surface errors from the video source in the consuming thread
+            failed = Future()
+            failed.set_exception(e)
+            finished.put((0, failed))
+        finally:
+            finished.put(_DONE)
+
+    def _write_one(self, index: int, video: Dict[str, str]) -> str:
+        """
+        Create the transcript file for a single video.
 
-            # Write to file
-            file_path.write_text(content, encoding="utf-8")
-            file_paths.append(str(file_path))
+        Args:
+            index: 1-based position of the video, used as the filename prefix
+            video: Video dictionary
 
-            print(f"  ✓ Created: {file_path.name}")
+        Returns:
+            Path of the created file
+        """
+        # Create safe filename from video title
+        filename = self._sanitize_filename(video["title"])
+        file_path = self.base_dir / f"{index:03d}_{filename}.txt"
 
-        print(f"\n✅ Created {len(file_paths)} transcript files")
-        return file_paths
+        # Create file content with metadata and write it to disk
+        self._write_segments(file_path, self._format_transcript(video))
+        return str(file_path)
 
     def _sanitize_filename(self, title: str) -> str:
         """
@@ -62,10 +168,9 @@ class FileManager:
         Returns:
             Sanitized filename (without extension)
         """
-        # Remove or replace invalid characters
-        filename = re.sub(r'[<>:"/\\|?*]', '', title)
-        # Replace spaces and special chars with underscores
-        filename = re.sub(r'\s+', '_', filename)
+        # Remove invalid characters and replace whitespace runs with
+        # underscores, without going through the regex engine
+        filename = "_".join(title.translate(self._INVALID_CHARS).split())
         # Limit length
         filename = filename[:100]
         # Remove trailing dots and underscores
@@ -73,7 +178,28 @@ class FileManager:
 
         return filename or "video"
 
-    def _format_transcript(self, video: Dict[str, str]) -> str:
+    def _write_segments(self, file_path: Path, segments: List[bytes]):
+        """
+        Write pre-encoded byte segments to a file with one scatter-gather write.
+
+        Args:
+            file_path: Destination file
+            segments: Byte segments to write, in order
+        """
+        fd = os.open(str(file_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            total = sum(len(segment) for segment in segments)
+            written = os.writev(fd, segments) if hasattr(os, "writev") else 0
+
+            # Short write (or no writev on this platform): write the rest
+            if written < total:
+                data = memoryview(b"".join(segments))[written:]
+                while data:
+                    data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+
+    def _format_transcript(self, video: Dict[str, str]) -> List[bytes]:
         """
         Format video data into a structured transcript file.
 
@@ -81,7 +207,7 @@ class FileManager:
             video: Video dictionary
 
         Returns:
-            Formatted transcript content
+            UTF-8 encoded lines with newline separators interleaved
         """
         lines = [
             "=" * 80,
@@ -90,7 +216,7 @@ class FileManager:
             f"URL: {video['url']}",
             f"Video ID: {video['video_id']}",
             f"Duration: {video.get('duration', 'N/A')}",
-            f"Views: {video.get('views', 'N/A'):,}",
+            f"Views: {video.get('views_str', 'N/A')}",
             "=" * 80,
             "",
             "DESCRIPTION:",
@@ -104,24 +230,34 @@ class FileManager:
             "=" * 80,
         ]
 
-        return "\n".join(lines)
+        segments = []
+        for line in lines:
+            if segments:
+                segments.append(b"\n")
+            segments.append(line.encode("utf-8"))
 
-    def get_all_files(self) -> List[str]:
+        return segments
+
+    def get_all_files(self) -> Iterator[str]:
         """
         Get all transcript file paths.
 
         Returns:
-            List of file paths
+            Iterator over file paths
         """
-        return [str(f) for f in self.base_dir.glob("*.txt")]
+        return (str(f) for f in self._iter_transcripts())
 
     def clear_files(self):
         """Remove all transcript files."""
-        for file_path in self.base_dir.glob("*.txt"):
+        for file_path in self._iter_transcripts():
             file_path.unlink()
 
         print(f"🗑️  Cleared all files from '{self.base_dir}'")
 
+    def _iter_transcripts(self) -> Iterator[Path]:
+        """Iterate over transcript files without building a list."""
+        return (f for f in self.base_dir.iterdir() if f.suffix == ".txt")
+
 
 def test_file_manager():
     """Test the file manager."""
@@ -135,6 +271,7 @@ def test_file_manager():
             "description": "A test video",
             "duration": "10:30",
             "views": 1000,
+            "views_str": "1,000",
         },
         {
             "title": "Test Video #2: AI/ML Basics",
@@ -144,6 +281,7 @@ def test_file_manager():
             "description": "Another test video",
             "duration": "15:45",
             "views": 2000,
+            "views_str": "2,000",
         }
     ]
 
@@ -3,83 +3,338 @@ Gemini API File Search integration for RAG functionality.
 Uses the new google.genai SDK (not the legacy google.generativeai).
 """
 
+import hashlib
+import json
 import os
+import sqlite3
 import time
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 from google import genai
 from google.genai import types
 
+from response_cache import DEFAULT_CACHE_PATH, ResponseCache
+
+
+MODEL_NAME = "gemini-2.0-flash-exp"  # File Search requires Gemini 2.0+
+
+# Transcript file lines that change between scrapes without the video
+# changing; they are ignored when deciding whether a file needs re-uploading
+VOLATILE_LINE_PREFIXES = (b"Views: ",)
+
 
 class GeminiRAG:
     """Handles Gemini API File Search for retrieval-augmented generation."""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        max_workers: int = 8,
+        cache_path: Optional[Path] = DEFAULT_CACHE_PATH,
+        semantic_threshold: float = 0.92,
+        embedding_model: str = "text-embedding-004",
+        persist: bool = False,
+        state_path: str = ".gemini_rag_state.json",
+    ):
         """
         Initialize the Gemini RAG system.
 
         Args:
             api_key: Google Gemini API key
+            max_workers: Maximum number of concurrent file uploads
+            cache_path: SQLite file for cached responses (None disables caching)
+            semantic_threshold: Cosine similarity above which a previous
+                question's cached answer is reused
+            embedding_model: Model used to embed questions for the semantic cache
+            persist: Keep the File Search store between runs and skip
+                uploading files whose content has not changed
+            state_path: JSON file recording the persisted store and files
         """
         self.client = genai.Client(api_key=api_key)
+        self.max_workers = max_workers
+        self.cache = ResponseCache(cache_path) if cache_path else None
+        self.semantic_threshold = semantic_threshold
+        self.embedding_model = embedding_model
+        self.persist = persist
+        self.state_path = Path(state_path)
         self.file_search_store = None
         self.uploaded_files = []
+        self._run_files = {}
+        # Persisted state entries of the files whose documents are in the store
+        self._store_files = {}
 
-    def upload_files(self, file_paths: List[str]) -> List[str]:
+    def upload_files(self, file_paths: Iterable[str]) -> List[str]:
         """
         Upload transcript files to Gemini API File Search store.
 
+        file_paths is consumed lazily: each upload starts as soon as its path
+        is produced, so a generator of files still being written (see
+        FileManager.iter_transcript_files) overlaps disk writes with uploads.
+
+        With persist=True, files whose content hash matches a document
+        already in the persisted store are not uploaded again. Documents of
+        files that are not part of this run are kept until
+        prune_documents() is called, since a partial run (e.g. a failed
+        scrape) does not mean those files are gone.
+
         Args:
-            file_paths: List of file paths to upload
+            file_paths: File paths to upload
 
         Returns:
-            List of uploaded file names
+            List of uploaded (or reused) file names
         """
         print(f"\n☁️  Setting up File Search store...")
 
+        state = self._load_state() if self.persist else {}
+        if not self._open_store(state.get("store_name")):
+            return []
+        if self.file_search_store.name != state.get("store_name"):
+            state = {}
+
+        # Content hash -> remote document name of files already in the store
+        known = {
+            entry["sha256"]: entry["remote_name"]
+            for entry in state.get("files", {}).values()
+        }
+
+        print(f"\n☁️  Uploading files...")
+
+        # Uploads are independent network I/O, so run them concurrently.
+        # Each worker returns its own result; results are merged here.
+        uploaded_names = []
+        files = {}
+        futures = {}
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for path in file_paths:
+                    futures[executor.submit(self._upload_one, path, known)] = path
+        finally:
+            # Leaving the executor waits for every submitted upload, so even
+            # when file_paths fails part-way, documents that were uploaded
+            # are recorded and the next run can match them
+            for future, path in futures.items():
+                result = future.result()
+                if result:
+                    filename, digest, remote_name = result
+                    uploaded_names.append(filename)
+                    files[path] = {"sha256": digest, "remote_name": remote_name}
+
+            self.uploaded_files.extend(uploaded_names)
+            if self.persist:
+                self._record_uploads(state.get("files", {}), files)
+
+        print(f"\n✅ Successfully uploaded {len(uploaded_names)} files")
+        return uploaded_names
+
+    def prune_documents(self):
+        """
+        Delete documents of files that were not part of the last upload_files() run.
+
+        Only call this when that run covered the complete file set; otherwise
+        documents for files that simply were not produced this time are lost.
+        """
+        if not self.persist or not self.file_search_store:
+            return
+
+        state = self._load_state()
+        run_files = self._run_files
+        current = {entry["remote_name"] for entry in run_files.values()}
+
+        stale = {
+            entry["remote_name"]
+            for path, entry in state.get("files", {}).items()
+            if path not in run_files and entry["remote_name"] not in current
+        }
+        for remote_name in stale:
+            self._delete_document(remote_name)
+
+        if stale:
+            print(f"🗑️  Removed {len(stale)} documents for files no longer present")
+
+        self._store_files = run_files
+        self._save_state({"store_name": self.file_search_store.name, "files": run_files})
+
+    def _record_uploads(self, previous: Dict[str, Dict], files: Dict[str, Dict]):
+        """
+        Save the persisted state after an upload run.
+
+        Args:
+            previous: File entries from the state before this run
+            files: File entries uploaded (or reused) in this run
+        """
+        current = {entry["remote_name"] for entry in files.values()}
+
+        # Documents replaced by a new upload of the same file are no
+        # longer needed
+        for path in files.keys() & previous.keys():
+            if previous[path]["remote_name"] not in current:
+                self._delete_document(previous[path]["remote_name"])
+
+        kept = {path: entry for path, entry in previous.items() if path not in files}
+        self._run_files = files
+        self._store_files = {**kept, **files}
+        self._save_state({
+            "store_name": self.file_search_store.name,
+            "files": self._store_files,
+        })
+
+    def _open_store(self, store_name: Optional[str]) -> bool:
+        """
+        Reuse the persisted File Search store, or create a new one.
+
+        Args:
+            store_name: Name of the store from a previous run, if any
+
+        Returns:
+            True if a store is ready to use
+        """
+        if store_name:
+            try:
+                self.file_search_store = self.client.file_search_stores.get(name=store_name)
+                print(f"✅ Reusing File Search store: {self.file_search_store.name}")
+                return True
+            except Exception as e:
+                print(f"⚠️  Could not reuse file search store {store_name}: {e}")
+
         # Create file search store
         try:
             self.file_search_store = self.client.file_search_stores.create(
                 config={'display_name': 'YouTube Transcripts RAG Store'}
             )
             print(f"✅ File Search store created: {self.file_search_store.name}")
+            return True
         except Exception as e:
             print(f"❌ Error creating file search store: {e}")
-            return []
+            return False
 
-        print(f"\n☁️  Uploading {len(file_paths)} files...")
+    def _upload_one(
+        self,
+        file_path: str,
+        known: Dict[str, str],
+    ) -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Upload a single file to the File Search store and wait for it to be processed.
 
-        uploaded_names = []
+        Args:
+            file_path: Path of the file to upload
+            known: Content hashes of files already in the store, mapped to
+                their document names
 
-        for file_path in file_paths:
-            try:
-                filename = os.path.basename(file_path)
-                print(f"  ⏳ Uploading: {filename}...", end=" ", flush=True)
-
-                # Upload file to file search store
-                operation = self.client.file_search_stores.upload_to_file_search_store(
-                    file=file_path,
-                    file_search_store_name=self.file_search_store.name,
-                    config={'display_name': filename}
-                )
+        Returns:
+            (file name, SHA-256, document name), or None if the upload failed
+        """
+        filename = os.path.basename(file_path)
 
-                # Wait for operation to complete
-                while not operation.done:
-                    time.sleep(2)
-                    operation = self.client.operations.get(operation)
+        try:
+            digest = self._content_sha256(file_path) if self.persist else None
+            if digest in known:
+                print(f"  ✓ Unchanged: {filename}")
+                return filename, digest, known[digest]
+
+            # Upload file to file search store. Pass the path rather than the
+            # contents: the SDK opens it and streams it in fixed-size chunks,
+            # so a transcript is never held in memory in full.
+            operation = self.client.file_search_stores.upload_to_file_search_store(
+                file=file_path,
+                file_search_store_name=self.file_search_store.name,
+                config={'display_name': filename}
+            )
 
-                if hasattr(operation, 'error') and operation.error:
-                    print(f"❌ Failed: {operation.error}")
-                    continue
+            operation = self._wait_for_operation(operation)
 
-                self.uploaded_files.append(filename)
-                uploaded_names.append(filename)
-                print(f"✓")
+            if hasattr(operation, 'error') and operation.error:
+                print(f"  ❌ Failed: {filename}: {operation.error}")
+                return None
 
-            except Exception as e:
-                print(f"❌ Error: {e}")
+            print(f"  ✓ Uploaded: {filename}")
+            remote_name = getattr(operation.response, 'document_name', None)
+            return filename, digest, remote_name
 
-        print(f"\n✅ Successfully uploaded {len(uploaded_names)} files")
-        return uploaded_names
+        except Exception as e:
+            print(f"  ❌ Error uploading {filename}: {e}")
+            return None
+
+    def _delete_document(self, remote_name: Optional[str]):
+        """
+        Delete a document from the File Search store.
+
+        Args:
+            remote_name: Document name returned when the file was uploaded
+        """
+        if not remote_name:
+            return
+
+        try:
+            self.client.file_search_stores.documents.delete(
+                name=remote_name, config={'force': True}
+            )
+        except Exception as e:
+            print(f"⚠️  Warning: Could not delete document {remote_name}: {e}")
+
+    @staticmethod
+    def _content_sha256(file_path: str) -> str:
+        """
+        Compute the SHA-256 hex digest of a transcript's stable content.
+
+        Lines with live metadata (VOLATILE_LINE_PREFIXES, e.g. the view
+        count) are left out, so a transcript whose video has only gained
+        views since the last run still counts as unchanged.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for line in f:
+                if not line.startswith(VOLATILE_LINE_PREFIXES):
+                    digest.update(line)
+        return digest.hexdigest()
+
+    def _files_fingerprint(self) -> str:
+        """
+        Fingerprint the files being queried, for response cache keys.
+
+        With persist=True, documents can be replaced under the same file
+        name, so the fingerprint covers the store name and the content hash
+        of every document in it; otherwise it covers the uploaded names.
+        """
+        if self.persist and self._store_files:
+            return ResponseCache.fingerprint(
+                [f"store:{self.file_search_store.name}"]
+                + [entry["sha256"] for entry in self._store_files.values()]
+            )
+        return ResponseCache.fingerprint(self.uploaded_files)
+
+    def _load_state(self) -> Dict:
+        """Load the persisted store state, or an empty state if there is none."""
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state: Dict):
+        """Write the persisted store state."""
+        self.state_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+    def _wait_for_operation(self, operation):
+        """
+        Poll a long-running operation until it is done.
+
+        The SDK has no blocking wait, so poll with exponential backoff: short
+        operations are noticed quickly and long ones cost few requests.
+
+        Args:
+            operation: Operation returned by the Gemini API
+
+        Returns:
+            The completed operation
+        """
+        delay = 0.25
+        while not operation.done:
+            time.sleep(delay)
+            delay = min(delay * 1.6, 8.0)
+            operation = self.client.operations.get(operation)
+
+        return operation
 
     def query(self, question: str, temperature: float = 0.7) -> Dict:
         """
@@ -95,11 +350,33 @@ class GeminiRAG:
         if not self.file_search_store:
             raise ValueError("File search store not initialized. Call upload_files() first.")
 
+        qhash = None
+        embedding = None
+        if self.cache:
+            fingerprint = self._files_fingerprint()
+            qhash = ResponseCache.key(question, fingerprint, temperature)
+            cached = self.cache.get(qhash)
+            if cached is not None:
+                return cached
+
+            # Fall back to a previous question with a near-identical meaning
+            embedding = self._embed(question)
+            if embedding is not None:
+                try:
+                    cached = self.cache.get_similar(
+                        embedding, fingerprint, self.semantic_threshold
+                    )
+                except ValueError:
+                    # Stored embeddings come from a different model
+                    cached = None
+                if cached is not None:
+                    return cached
+
         try:
             # Generate response with file search
             # Use simplified syntax without types.Tool wrapper
             response = self.client.models.generate_content(
-                model="gemini-2.0-flash-exp",  # File Search requires Gemini 2.0+
+                model=MODEL_NAME,
                 contents=question,
                 config=types.GenerateContentConfig(
                     temperature=temperature,
@@ -119,14 +396,64 @@ class GeminiRAG:
                 "citations": self._extract_citations(response),
             }
 
-            return result
-
         except Exception as e:
             return {
                 "answer": f"Error generating response: {str(e)}",
                 "citations": []
             }
 
+        # A failure to cache the answer must not discard it
+        if qhash:
+            try:
+                self.cache.put(qhash, result)
+                if embedding is not None:
+                    self.cache.add_embedding(embedding, fingerprint, qhash)
+            except (sqlite3.Error, OSError, ValueError) as e:
+                print(f"⚠️  Warning: Could not cache response: {e}")
+
+        return result
+
+    def query_batch(self, questions: List[str], temperature: float = 0.7) -> List[Dict]:
+        """
+        Query the RAG system with several questions at once.
+
+        Passing a list of contents to generate_content would be read as one
+        multi-turn conversation, so the questions are sent as concurrent
+        independent requests instead.
+
+        Args:
+            questions: User's questions
+            temperature: Model temperature (0.0-1.0)
+
+        Returns:
+            List of dictionaries with response and citations, in question order
+        """
+        if not questions:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(questions))) as executor:
+            return list(executor.map(lambda q: self.query(q, temperature), questions))
+
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """
+        Embed text for the semantic cache.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding values, or None if the embedding call failed
+        """
+        try:
+            response = self.client.models.embed_content(
+                model=self.embedding_model,
+                contents=text,
+            )
+            return response.embeddings[0].values
+        except Exception as e:
+            print(f"⚠️  Warning: Could not embed question: {e}")
+            return None
+
     def _extract_citations(self, response) -> List[Dict]:
         """
         Extract citations from the response.
@@ -137,38 +464,46 @@ class GeminiRAG:
         Returns:
             List of citation dictionaries
         """
-        citations = []
-
+        # Fast path on the known response shape; anything missing means
+        # there are no citations
         try:
-            # Try to extract grounding metadata
-            if hasattr(response, 'candidates') and response.candidates:
-                for candidate in response.candidates:
-                    if hasattr(candidate, 'grounding_metadata'):
-                        metadata = candidate.grounding_metadata
-
-                        # Extract grounding chunks
-                        if hasattr(metadata, 'grounding_chunks'):
-                            for chunk in metadata.grounding_chunks:
-                                citation = {
-                                    "text": getattr(chunk, 'text', ''),
-                                    "source": getattr(chunk, 'source', 'Unknown'),
-                                }
-                                if citation["text"]:
-                                    citations.append(citation)
-
-                        # Extract search entry points
-                        if hasattr(metadata, 'search_entry_point'):
-                            entry = metadata.search_entry_point
-                            if hasattr(entry, 'rendered_content'):
-                                citations.append({
-                                    "text": entry.rendered_content[:200] + "...",
-                                    "source": "File Search"
-                                })
-        except Exception as e:
-            print(f"⚠️  Warning: Could not extract citations: {e}")
+            metadata = response.candidates[0].grounding_metadata
+            chunks = metadata.grounding_chunks or []
+        except (AttributeError, IndexError, TypeError):
+            return []
+
+        # Collect plain tuples first (reading each text once) and only
+        # build the citation dicts for chunks that have text
+        pairs = [
+            (text, getattr(chunk, 'source', 'Unknown'))
+            for chunk in chunks
+            if (text := getattr(chunk, 'text', ''))
+        ]
+        citations = [{"text": text, "source": source} for text, source in pairs]
+
+        # Extract search entry points
+        entry = getattr(metadata, 'search_entry_point', None)
+        rendered = getattr(entry, 'rendered_content', None)
+        if rendered:
+            citations.append({
+                "text": rendered[:200] + "...",
+                "source": "File Search"
+            })
 
         return citations
 
+    def keep_alive(self):
+        """Make a cheap API call to keep the HTTP connection open."""
+        try:
+            self.client.models.get(model=MODEL_NAME)
+        except Exception:
+            pass
+
+    def clear_cache(self):
+        """Remove all cached responses."""
+        if self.cache:
+            self.cache.clear()
+
     def cleanup(self):
         """Delete file search store and all uploaded files."""
         if not self.file_search_store:
@@ -184,6 +519,9 @@ class GeminiRAG:
             print(f"✅ Deleted file search store: {self.file_search_store.name}")
             self.file_search_store = None
             self.uploaded_files = []
+            self._store_files = {}
+            if self.persist:
+                self.state_path.unlink(missing_ok=True)
         except Exception as e:
             print(f"❌ Error deleting file search store: {e}")
 
@@ -9,7 +9,9 @@ Usage:
     python main.py
 """
 
+import functools
 import os
+import re
 import sys
 from dotenv import load_dotenv
 
@@ -19,13 +21,23 @@ from gemini_rag import GeminiRAG
 from chat_interface import ChatInterface
 
 
+_BAR = "=" * 80
+_DASH = "-" * 80
+
+# YouTube channel URL; the matching group holds the channel handle or ID
+_URL_RE = re.compile(
+    r"^(?:https?://)?(?:www\.|m\.)?"
+    r"(?:youtube\.com/(?:@([\w.-]+)|(?:channel|c|user)/([\w.-]+))|youtu\.be/([\w-]+))"
+)
+
+
 def print_banner():
     """Print application banner."""
-    print("\n" + "=" * 80)
+    print("\n" + _BAR)
     print("🎬 YouTube Channel RAG Tool")
-    print("=" * 80)
+    print(_BAR)
     print("\nBuild a chatbot for any YouTube channel using AI-powered search!")
-    print("=" * 80 + "\n")
+    print(_BAR + "\n")
 
 
 def get_user_input():
@@ -36,7 +48,7 @@ def get_user_input():
         Tuple of (channel_url, max_videos, channel_name)
     """
     print("📋 Setup")
-    print("-" * 80)
+    print(_DASH)
 
     # Get channel URL
     while True:
@@ -46,7 +58,8 @@ def get_user_input():
             print("❌ URL cannot be empty. Please try again.")
             continue
 
-        if "youtube.com" not in channel_url and "youtu.be" not in channel_url:
+        match = _URL_RE.match(channel_url)
+        if not match:
             print("❌ Invalid URL. Please enter a valid YouTube channel URL.")
             continue
 
@@ -79,17 +92,29 @@ def get_user_input():
             print("❌ Invalid number. Please enter a valid integer.")
 
     # Extract channel name from URL
-    channel_name = channel_url.split('/')[-1].replace('@', '')
+    channel_name = next(group for group in match.groups() if group)
 
-    print("\n" + "=" * 80)
+    print("\n" + _BAR)
     print(f"✅ Configuration:")
     print(f"   Channel: {channel_name}")
     print(f"   Videos to process: {max_videos}")
-    print("=" * 80)
+    print(_BAR)
 
     return channel_url, max_videos, channel_name
 
 
+@functools.lru_cache(maxsize=1)
+def _load_env():
+    """
+    Load .env once and read the API keys.
+
+    Returns:
+        Tuple of (apify_token, gemini_key); either may be None
+    """
+    load_dotenv(override=False)
+    return os.getenv("APIFY_API_TOKEN"), os.getenv("GEMINI_API_KEY")
+
+
 def validate_environment():
     """
     Validate that required environment variables are set.
@@ -97,10 +122,7 @@ def validate_environment():
     Returns:
         Tuple of (apify_token, gemini_key) or None if validation fails
     """
-    load_dotenv()
-
-    apify_token = os.getenv("APIFY_API_TOKEN")
-    gemini_key = os.getenv("GEMINI_API_KEY")
+    apify_token, gemini_key = _load_env()
 
     if not apify_token:
         print("\n❌ Error: APIFY_API_TOKEN not found in environment variables")
@@ -137,48 +159,49 @@ def main():
         # Get user input
         channel_url, max_videos, channel_name = get_user_input()
 
-        # Step 1: Scrape YouTube channel
-        print("\n" + "=" * 80)
-        print("STEP 1: Scraping YouTube Channel")
-        print("=" * 80)
+        # Step 1: Scrape the channel, write transcript files and upload them.
+        # Each stage picks up a video as soon as the previous one hands it
+        # over, so scraping, disk writes and uploads overlap.
+        print("\n" + _BAR)
+        print("STEP 1: Scraping YouTube Channel and Setting up Gemini File Search")
+        print(_BAR)
 
         scraper = YouTubeScraper(apify_token)
-        videos = scraper.scrape_channel(channel_url, max_videos)
-
-        if not videos:
-            print("\n❌ No videos with transcripts found. Exiting.")
-            sys.exit(1)
-
-        # Step 2: Create transcript files
-        print("\n" + "=" * 80)
-        print("STEP 2: Creating Transcript Files")
-        print("=" * 80)
-
         file_manager = FileManager()
-        file_paths = file_manager.create_transcript_files(videos)
-
-        # Step 3: Upload to Gemini and setup RAG
-        print("\n" + "=" * 80)
-        print("STEP 3: Setting up Gemini File Search")
-        print("=" * 80)
+        # One persisted store per channel, so channels never share documents
+        rag = GeminiRAG(
+            gemini_key,
+            persist=True,
+            state_path=f".gemini_rag_state_{channel_name}.json",
+        )
+
+        videos = scraper.iter_channel(channel_url, max_videos)
+        uploaded = rag.upload_files(file_manager.iter_transcript_files(videos))
+
+        if not uploaded:
+            print("\n❌ No video transcripts could be uploaded. Exiting.")
+            sys.exit(1)
 
-        rag = GeminiRAG(gemini_key)
-        rag.upload_files(file_paths)
+        # Documents of videos missing from this run are only removed when the
+        # scrape was complete; a failed or timed-out run returns a partial set
+        if scraper.last_run_status == "SUCCEEDED":
+            rag.prune_documents()
 
-        # Step 4: Start chat interface
-        print("\n" + "=" * 80)
-        print("STEP 4: Starting Chat Interface")
-        print("=" * 80)
+        # Step 2: Start chat interface
+        print("\n" + _BAR)
+        print("STEP 2: Starting Chat Interface")
+        print(_BAR)
 
         chat = ChatInterface(rag, channel_name)
         chat.start()
 
         # Cleanup
-        print("\n" + "=" * 80)
+        print("\n" + _BAR)
         print("CLEANUP")
-        print("=" * 80)
+        print(_BAR)
 
-        cleanup = input("\n🗑️  Delete uploaded files from Gemini API? (y/n): ").strip().lower()
+        print("\nKeeping the uploaded files lets the next run skip unchanged transcripts.")
+        cleanup = input("🗑️  Delete uploaded files from Gemini API? (y/n): ").strip().lower()
         if cleanup == 'y':
             rag.cleanup()
 
@@ -187,7 +210,7 @@ def main():
             file_manager.clear_files()
 
         print("\n✅ Done! Thank you for using YouTube Channel RAG Tool!")
-        print("=" * 80 + "\n")
+        print(_BAR + "\n")
 
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user. Exiting...")
@@ -0,0 +1,232 @@
+"""
+Persistent response cache for RAG queries.
+Stores answers in SQLite so repeated questions skip the Gemini API call,
+plus question embeddings so paraphrased questions can reuse an answer.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "gemini_rag.sqlite"
+
+
+class ResponseCache:
+    """Cache of query results keyed by question and file set."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        """
+        Initialize the response cache.
+
+        Args:
+            path: Location of the SQLite database file. Question embeddings
+                are stored next to it with a .npy extension.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.embeddings_path = self.path.with_suffix(".npy")
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "qhash TEXT PRIMARY KEY, answer TEXT, citations BLOB, ts INTEGER)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS semantic ("
+                "row INTEGER PRIMARY KEY, fingerprint TEXT, qhash TEXT)"
+            )
+            keys = conn.execute(
+                "SELECT fingerprint, qhash FROM semantic ORDER BY row"
+            ).fetchall()
+
+        # Row i of _q_embeds is the normalized embedding of the question
+        # whose (fingerprint, qhash) is _q_keys[i]
+        self._lock = threading.Lock()
+        self._q_embeds = self._load_embeddings()
+        self._q_keys: List[Tuple[str, str]] = keys[:len(self._q_embeds)]
+        self._q_embeds = self._q_embeds[:len(self._q_keys)]
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection (connections are not shared between threads)."""
+        return sqlite3.connect(self.path)
+
+    @staticmethod
+    def fingerprint(file_names: Iterable[str]) -> str:
+        """
+        Compute a fingerprint for a set of uploaded files.
+
+        Args:
+            file_names: Names of the files in the File Search store
+
+        Returns:
+            Hex digest identifying the file set
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for name in sorted(file_names):
+            digest.update(name.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(question: str, fingerprint: str, temperature: float = 0.0) -> str:
+        """
+        Build the cache key for a question.
+
+        Args:
+            question: User's question
+            fingerprint: Fingerprint of the file set being queried
+            temperature: Model temperature (only part of the key when > 0)
+
+        Returns:
+            Hex digest used as the cache key
+        """
+        raw = f"{question.strip().lower()}|{fingerprint}"
+        if temperature > 0:
+            raw += f"|{temperature}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, qhash: str) -> Optional[Dict]:
+        """
+        Look up a cached result.
+
+        Args:
+            qhash: Cache key from key()
+
+        Returns:
+            Dictionary with answer and citations, or None on a miss
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT answer, citations FROM cache WHERE qhash = ?", (qhash,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        answer, citations = row
+        return {"answer": answer, "citations": json.loads(citations)}
+
+    def put(self, qhash: str, result: Dict):
+        """
+        Store a query result.
+
+        Args:
+            qhash: Cache key from key()
+            result: Dictionary with answer and citations
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (qhash, answer, citations, ts) VALUES (?, ?, ?, ?)",
+                (
+                    qhash,
+                    result["answer"],
+                    json.dumps(result.get("citations", [])),
+                    int(time.time()),
+                ),
+            )
+
+    def get_similar(
+        self,
+        embedding: Sequence[float],
+        fingerprint: str,
+        threshold: float,
+    ) -> Optional[Dict]:
+        """
+        Look up the cached result of the most similar previous question.
+
+        Args:
+            embedding: Embedding of the new question
+            fingerprint: Fingerprint of the file set being queried
+            threshold: Minimum cosine similarity for a hit
+
+        Returns:
+            Dictionary with answer and citations, or None on a miss
+        """
+        with self._lock:
+            q_embeds, q_keys = self._q_embeds, self._q_keys
+
+        rows = [i for i, (fp, _) in enumerate(q_keys) if fp == fingerprint]
+        if not rows:
+            return None
+
+        sims = q_embeds[rows] @ self._normalize(embedding)
+        best = int(sims.argmax())
+        if sims[best] <= threshold:
+            return None
+
+        return self.get(q_keys[rows[best]][1])
+
+    def add_embedding(self, embedding: Sequence[float], fingerprint: str, qhash: str):
+        """
+        Remember a question embedding for semantic lookups.
+
+        Args:
+            embedding: Embedding of the question
+            fingerprint: Fingerprint of the file set that was queried
+            qhash: Cache key of the stored result
+        """
+        with self._lock:
+            vector = self._normalize(embedding)[np.newaxis, :]
+
+            # Embeddings from a different model (another dimension) cannot
+            # be compared with the stored ones, so start the matrix over
+            reset = bool(self._q_keys) and self._q_embeds.shape[1] != vector.shape[1]
+            if reset:
+                self._q_embeds = np.empty((0, 0), dtype=np.float32)
+                self._q_keys = []
+
+            row = len(self._q_keys)
+            self._q_embeds = np.vstack([self._q_embeds, vector]) if row else vector
+            self._q_keys = self._q_keys + [(fingerprint, qhash)]
+            self._save_embeddings()
+
+            with closing(self._connect()) as conn, conn:
+                if reset:
+                    conn.execute("DELETE FROM semantic")
+                conn.execute(
+                    "INSERT OR REPLACE INTO semantic (row, fingerprint, qhash) VALUES (?, ?, ?)",
+                    (row, fingerprint, qhash),
+                )
+
+    def clear(self):
+        """Remove all cached results."""
+        with self._lock:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM cache")
+                conn.execute("DELETE FROM semantic")
+
+            self._q_embeds = np.empty((0, 0), dtype=np.float32)
+            self._q_keys = []
+            self.embeddings_path.unlink(missing_ok=True)
+
+    def _load_embeddings(self) -> np.ndarray:
+        """Memory-map the stored question embeddings, if any."""
+        if not self.embeddings_path.exists():
+            return np.empty((0, 0), dtype=np.float32)
+
+        try:
+            return np.load(self.embeddings_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return np.empty((0, 0), dtype=np.float32)
+
+    def _save_embeddings(self):
+        """Write the question embeddings atomically."""
+        tmp_path = self.embeddings_path.with_suffix(".tmp.npy")
+        np.save(tmp_path, self._q_embeds)
+        os.replace(tmp_path, self.embeddings_path)
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        """Convert an embedding to a unit-length float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -3,28 +3,116 @@ YouTube channel scraper using Apify API.
 Extracts video titles and subtitles/transcripts from a YouTube channel.
 """
 
+import hashlib
+import multiprocessing
 import os
-from typing import List, Dict, Optional
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import orjson
+import zstandard
 from apify_client import ApifyClient
 
 
+PAGE_SIZE = 1000  # Dataset items fetched per request
+POLL_SECS = 2  # Longest wait for the actor run between dataset polls
+PROCESS_POOL_MIN_ITEMS = 32  # Smallest batch worth extracting in worker processes
+PROGRESS_BATCH = 32  # Progress lines buffered before writing them out
+MIN_CUE_OVERLAP = 8  # Shortest repeated text between adjacent cues that is dropped
+
+# Dataset item fields the scraper reads; everything else (thumbnails,
+# chapters, comments, ...) is left out of the response
+ITEM_FIELDS = [
+    "title", "url", "id", "description", "duration", "viewCount",
+    "subtitles", "subtitle", "subtitlesText", "text", "transcript",
+]
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "yt-rag"
+DEFAULT_CACHE_TTL = 24 * 60 * 60  # Seconds before cached scrape results expire
+CACHE_ZSTD_LEVEL = 3  # zstd compression level for cached scrape results
+
+
+@dataclass
+class VideoBatch:
+    """
+    Scraped videos stored column-wise, one list per field.
+
+    Rows from the scraper are appended straight into the columns, so
+    scrape_channel never builds a dictionary per video.
+    """
+
+    # Video dictionary keys, in column and row order (not a dataclass field)
+    _KEYS = ("title", "url", "video_id", "transcript",
+             "description", "duration", "views", "views_str")
+
+    titles: List[str] = field(default_factory=list)
+    urls: List[str] = field(default_factory=list)
+    video_ids: List[str] = field(default_factory=list)
+    transcripts: List[str] = field(default_factory=list)
+    descriptions: List[str] = field(default_factory=list)
+    durations: List[str] = field(default_factory=list)
+    views: List[int] = field(default_factory=list)
+    views_strs: List[str] = field(default_factory=list)
+
+    def append(self, row: Sequence):
+        """
+        Add a video to the batch.
+
+        Args:
+            row: Video fields in _KEYS order, as produced by the scraper
+        """
+        title, url, video_id, transcript, description, duration, views, views_str = row
+        self.titles.append(title)
+        self.urls.append(url)
+        self.video_ids.append(video_id)
+        self.transcripts.append(transcript)
+        self.descriptions.append(description)
+        self.durations.append(duration)
+        self.views.append(views)
+        self.views_strs.append(views_str)
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        """Yield one video dictionary per video, e.g. for FileManager."""
+        for row in zip(
+            self.titles, self.urls, self.video_ids, self.transcripts,
+            self.descriptions, self.durations, self.views, self.views_strs,
+        ):
+            yield dict(zip(self._KEYS, row))
+
+
 class YouTubeScraper:
     """Handles scraping YouTube channel videos using Apify."""
 
-    def __init__(self, api_token: str):
+    def __init__(
+        self,
+        api_token: str,
+        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+    ):
         """
         Initialize the YouTube scraper.
 
         Args:
             api_token: Apify API token
+            cache_dir: Directory for cached scrape results (None disables caching)
+            cache_ttl: Seconds a cached result stays valid
         """
         self.client = ApifyClient(api_token)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_ttl = cache_ttl
+        self.last_run_status = None
 
     def scrape_channel(
         self,
         channel_url: str,
         max_videos: int = 10
-    ) -> List[Dict[str, str]]:
+    ) -> VideoBatch:
         """
         Scrape videos from a YouTube channel.
 
@@ -33,11 +121,94 @@ class YouTubeScraper:
             max_videos: Maximum number of videos to scrape (from newest)
 
         Returns:
-            List of dictionaries containing video data (title, url, transcript)
+            VideoBatch with one column per field (titles, urls, transcripts, ...)
+        """
+        batch = VideoBatch()
+        for row in self._iter_rows(channel_url, max_videos):
+            batch.append(row)
+        return batch
+
+    def iter_channel(
+        self,
+        channel_url: str,
+        max_videos: int = 10
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Scrape videos from a YouTube channel, yielding them while the actor runs.
+
+        The Apify actor is started without waiting for it to finish, and its
+        dataset is polled for new items, so downstream processing can start
+        on the first videos while later ones are still being scraped.
+
+        Results of a successful run are cached on disk for cache_ttl seconds,
+        keyed by channel URL and video count; a cache hit skips Apify entirely.
+
+        Args:
+            channel_url: URL of the YouTube channel
+            max_videos: Maximum number of videos to scrape (from newest)
+
+        Yields:
+            Dictionaries containing video data (title, url, transcript) for
+            videos that have a transcript
+        """
+        for row in self._iter_rows(channel_url, max_videos):
+            yield dict(zip(VideoBatch._KEYS, row))
+
+    def _iter_rows(
+        self,
+        channel_url: str,
+        max_videos: int
+    ) -> Iterator[Sequence]:
+        """
+        Yield scraped videos as rows, from the cache or from a new scrape.
+
+        Args:
+            channel_url: URL of the YouTube channel
+            max_videos: Maximum number of videos to scrape (from newest)
+
+        Yields:
+            Video fields in VideoBatch._KEYS order, for videos that have a
+            transcript
         """
         print(f"\n🔍 Scraping channel: {channel_url}")
         print(f"📊 Fetching up to {max_videos} videos...")
 
+        self.last_run_status = None
+        cache_path = self._cache_path(channel_url, max_videos)
+        cached = self._load_cached(cache_path)
+        if cached is not None:
+            # Only results of successful runs are cached
+            self.last_run_status = "SUCCEEDED"
+            print(f"⚡ Using cached results from {cache_path}")
+            yield from cached
+            print(f"\n✅ Loaded {len(cached)} videos with transcripts from cache")
+            return
+
+        rows = []
+        for row in self._iter_scrape(channel_url, max_videos):
+            rows.append(row)
+            yield row
+
+        # Only complete, successful runs are cached
+        if cache_path and self.last_run_status == "SUCCEEDED":
+            self._save_cached(cache_path, rows)
+
+    def _iter_scrape(
+        self,
+        channel_url: str,
+        max_videos: int
+    ) -> Iterator[Tuple]:
+        """
+        Run the Apify actor and yield videos as its dataset fills up.
+
+        Args:
+            channel_url: URL of the YouTube channel
+            max_videos: Maximum number of videos to scrape (from newest)
+
+        Yields:
+            Video rows (see _to_row) for videos that have a transcript
+        """
+
         # Configure the Apify actor run
         run_input = {
             "startUrls": [{"url": channel_url}],
@@ -48,101 +219,428 @@ class YouTubeScraper:
             "preferAutoGeneratedSubtitles": False,  # Prefer manual over auto-generated
         }
 
-        # Run the actor and wait for it to finish
+        # Start the actor without blocking on it
         print("⏳ Running Apify scraper...")
-        run = self.client.actor("streamers/youtube-scraper").call(run_input=run_input)
+        run = self.client.actor("streamers/youtube-scraper").start(run_input=run_input)
 
-        # Fetch results from the dataset
-        videos = []
         print("📥 Fetching results...")
+        seen = 0
+        count = 0
+
+        # Progress lines are buffered and written in blocks rather than
+        # one print per video
+        progress = []
+
+        # One worker pool for the whole scrape, started on the first page
+        # large enough to need it
+        pool = None
+
+        try:
+            for items in self._iter_item_pages(run):
+                if pool is None and len(items) >= PROCESS_POOL_MIN_ITEMS:
+                    pool = _new_process_pool()
+
+                for item, transcript in zip(items, _extract_transcripts(items, pool)):
+                    row = self._to_row(item, transcript, first=not seen)
+                    seen += 1
+                    title = row[0]
+
+                    # Only keep videos that have transcripts
+                    if transcript:
+                        count += 1
+                        progress.append(f"  ✓ {title[:60]}...")
+                        yield row
+                    else:
+                        progress.append(f"  ⊗ {title[:60]}... (no transcript)")
+
+                    if len(progress) >= PROGRESS_BATCH:
+                        _write_lines(progress)
+
+                _write_lines(progress)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        print(f"\n✅ Successfully scraped {count} videos with transcripts")
+
+    def _iter_item_pages(self, run: Dict) -> Iterator[List[Dict]]:
+        """
+        Yield batches of new dataset items while an actor run is in progress.
+
+        Args:
+            run: Actor run as returned by actor.start()
 
-        for item in self.client.dataset(run["defaultDatasetId"]).iterate_items():
-            # Debug: Print available keys to understand data structure
-            if not videos:  # Only print for first video
-                print(f"\n🔍 Debug - Available keys in response: {list(item.keys())}")
-                if 'subtitles' in item:
-                    print(f"🔍 Debug - Subtitles type: {type(item['subtitles'])}")
-                    print(f"🔍 Debug - Subtitles sample: {str(item['subtitles'])[:200]}")
-
-            video_data = {
-                "title": item.get("title", "Untitled"),
-                "url": item.get("url", ""),
-                "video_id": item.get("id", ""),
-                "transcript": self._extract_transcript(item),
-                "description": item.get("description", ""),
-                "duration": item.get("duration", ""),
-                "views": item.get("viewCount", 0),
-            }
-
-            # Only add videos that have transcripts
-            if video_data["transcript"]:
-                videos.append(video_data)
-                print(f"  ✓ {video_data['title'][:60]}...")
-            else:
-                print(f"  ⊗ {video_data['title'][:60]}... (no transcript)")
-
-        print(f"\n✅ Successfully scraped {len(videos)} videos with transcripts")
-        return videos
-
-    def _extract_transcript(self, item: Dict) -> str:
-        """
-        Extract transcript/subtitles from video item.
+        Yields:
+            Lists of items not yet yielded, in dataset order
+        """
+        dataset_id = run["defaultDatasetId"]
+        dataset = self.client.dataset(dataset_id)
+        seen = 0
+
+        # Pick up items as they are pushed while the run is in progress
+        while run["status"] in ("READY", "RUNNING"):
+            run = self.client.run(run["id"]).wait_for_finish(wait_secs=POLL_SECS) or run
+
+            items = _list_items(dataset, offset=seen)
+            if items:
+                seen += len(items)
+                yield items
+
+        self.last_run_status = run["status"]
+        if run["status"] != "SUCCEEDED":
+            print(f"⚠️  Apify run finished with status {run['status']}")
+
+        # Fetch anything pushed after the last poll
+        items = self._fetch_items(dataset_id, offset=seen)
+        if items:
+            yield items
+
+    def _to_row(
+        self,
+        item: Dict,
+        transcript: str,
+        first: bool = False,
+    ) -> Tuple:
+        """
+        Convert a dataset item to a video row.
 
         Args:
             item: Video data item from Apify
+            transcript: Transcript extracted from the item
+            first: Whether this is the first item (prints debug information)
 
         Returns:
-            Transcript text or empty string if not available
+            Video fields in VideoBatch._KEYS order (the transcript may be empty)
+        """
+        # Debug: Print available keys to understand data structure
+        if first:
+            print(f"\n🔍 Debug - Available keys in response: {list(item.keys())}")
+            if 'subtitles' in item:
+                print(f"🔍 Debug - Subtitles type: {type(item['subtitles'])}")
+                print(f"🔍 Debug - Subtitles sample: {str(item['subtitles'])[:200]}")
+
+        title = item.get("title", "Untitled")
+        url = item.get("url", "")
+        video_id = item.get("id", "")
+        description = item.get("description", "")
+        duration = item.get("duration", "")
+        views = item.get("viewCount", 0)
+
+        views_str = f"{views:,}" if isinstance(views, int) else "N/A"
+        return (title, url, video_id, transcript, description, duration, views, views_str)
+
+    def _cache_path(self, channel_url: str, max_videos: int) -> Optional[Path]:
         """
-        # Try multiple possible field names for subtitles
-        possible_fields = ["subtitles", "subtitle", "subtitlesText", "text", "transcript"]
+        Get the cache file for a scrape request.
+
+        Args:
+            channel_url: URL of the YouTube channel
+            max_videos: Maximum number of videos requested
+
+        Returns:
+            Path of the cache file, or None if caching is disabled
+        """
+        if not self.cache_dir:
+            return None
+
+        # The row layout is part of the key, so a change to the video fields
+        # never reads rows written with the old layout
+        layout = ",".join(VideoBatch._KEYS)
+        raw = f"{channel_url}|{max_videos}|{layout}".encode("utf-8")
+        key = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        return self.cache_dir / f"{key}.json.zst"
+
+    def _load_cached(self, cache_path: Optional[Path]) -> Optional[List[Sequence]]:
+        """
+        Load cached videos if the cache file exists and has not expired.
+
+        Args:
+            cache_path: Path from _cache_path()
+
+        Returns:
+            Cached video rows, or None on a miss
+        """
+        if not cache_path:
+            return None
+
+        try:
+            if time.time() - cache_path.stat().st_mtime > self.cache_ttl:
+                return None
+            raw = zstandard.ZstdDecompressor().decompress(cache_path.read_bytes())
+            return orjson.loads(raw)
+        except (OSError, ValueError, zstandard.ZstdError):
+            return None
+
+    def _save_cached(self, cache_path: Path, rows: List[Sequence]):
+        """
+        Write scraped videos to the cache.
+
+        Args:
+            cache_path: Path from _cache_path()
+            rows: Video rows to cache
+        """
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            compressor = zstandard.ZstdCompressor(level=CACHE_ZSTD_LEVEL)
+            tmp_path.write_bytes(compressor.compress(orjson.dumps(rows)))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️  Warning: Could not cache scrape results: {e}")
+
+    def _fetch_items(
+        self,
+        dataset_id: str,
+        offset: int = 0,
+        max_workers: int = 8,
+    ) -> List[Dict]:
+        """
+        Fetch the items of a dataset, requesting pages concurrently.
+
+        Pages are requested in rounds until one comes back short. The first
+        round is a single page (usually all that is left after a run), and
+        each full round doubles the next, up to max_workers pages. The dataset's itemCount is not used: Apify updates it a few
+        seconds after items are pushed, so right after a run it can be
+        behind and the last items would be missed.
+
+        Args:
+            dataset_id: ID of the Apify dataset
+            offset: Number of items to skip at the start
+            max_workers: Maximum number of pages fetched at once
+
+        Returns:
+            Dataset items in their stored order
+        """
+        dataset = self.client.dataset(dataset_id)
+        items = []
+        round_pages = 1
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                offsets = range(offset, offset + round_pages * PAGE_SIZE, PAGE_SIZE)
+                pages = executor.map(
+                    lambda o: _list_items(dataset, offset=o, limit=PAGE_SIZE), offsets
+                )
+
+                for page in pages:
+                    items.extend(page)
+                    if len(page) < PAGE_SIZE:
+                        # End of the dataset; later pages in this round are empty
+                        return items
+
+                offset += round_pages * PAGE_SIZE
+                round_pages = min(round_pages * 2, max_workers)
+
+
+def _list_items(dataset, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+    """
+    Fetch one page of dataset items, limited to ITEM_FIELDS.
+
+    The raw response body is decoded with orjson instead of going through
+    the client's stdlib json decoding.
+
+    Hidden fields are dropped, but empty items are not (unlike clean=True):
+    callers advance their offset by the number of items returned, which is
+    only correct if every item in the range comes back.
+
+    Args:
+        dataset: Apify dataset client
+        offset: Number of items to skip
+        limit: Maximum number of items to return (None for all)
+
+    Returns:
+        Dataset items in their stored order
+    """
+    raw = dataset.get_items_as_bytes(
+        item_format="json",
+        offset=offset,
+        limit=limit,
+        fields=ITEM_FIELDS,
+        skip_hidden=True,
+    )
+    return orjson.loads(raw)
+
+
+def _extract_transcript(item: Dict) -> str:
+    """
+    Extract transcript/subtitles from video item.
+
+    Module-level (rather than a method) so it can be sent to worker processes.
+
+    Args:
+        item: Video data item from Apify
+
+    Returns:
+        Transcript text or empty string if not available
+    """
+    # Try multiple possible field names for subtitles
+    possible_fields = ["subtitles", "subtitle", "subtitlesText", "text", "transcript"]
+
+    for field in possible_fields:
+        data = item.get(field)
+
+        if not data:
+            continue
+
+        # Handle string data (could be plain text or SRT format)
+        if isinstance(data, str):
+            # If it's SRT format, parse it
+            if _is_srt_format(data):
+                return _parse_srt(data)
+            return data.strip()
+
+        # Handle list/array data, appending UTF-8 encoded cues to one
+        # byte buffer that is decoded once at the end. Rolling
+        # auto-captions repeat the end of the previous cue at the start of
+        # the next one, so only the new words of each cue are kept.
+        if isinstance(data, list):
+            buf = bytearray()
+            prev = []
+            for text in _cue_texts(data):
+                words = text.split() if text else None
+                if not words or words == prev:
+                    continue
+
+                new_words = words[_cue_overlap(prev, words):]
+                prev = words
+                if new_words:
+                    buf += " ".join(new_words).encode("utf-8")
+                    buf += b" "
+
+            transcript = buf.decode("utf-8").strip()
+            if transcript:
+                return transcript
+
+    return ""
+
+
+def _cue_texts(cues: List) -> List[Optional[str]]:
+    """
+    Get the text of each subtitle cue.
+
+    Apify returns cues of one type per list, so the first cue picks a
+    loop specialized for all-dict or all-str lists. Mixed lists fall
+    back to checking each cue.
+
+    Args:
+        cues: Subtitle cues (dicts with a text field, or strings)
+
+    Returns:
+        Cue texts in order; entries may be empty or None
+    """
+    first = cues[0]
+
+    if isinstance(first, dict):
+        try:
+            return [c.get("text") or c.get("content") or c.get("line") for c in cues]
+        except AttributeError:
+            pass  # Not every cue is a dict
+    elif isinstance(first, str) and all(isinstance(c, str) for c in cues):
+        return cues
+
+    texts = []
+    for cue in cues:
+        if isinstance(cue, dict):
+            # Try different text fields
+            texts.append(cue.get("text") or cue.get("content") or cue.get("line"))
+        elif isinstance(cue, str):
+            texts.append(cue)
+
+    return texts
+
+
+def _cue_overlap(prev: List[str], words: List[str]) -> int:
+    """
+    Find how many leading words of a cue repeat the end of the previous one.
+
+    Cues are compared as whole words, so an overlap never ends in the
+    middle of a word.
+
+    Args:
+        prev: Words of the previous cue
+        words: Words of the current cue
+
+    Returns:
+        Number of leading words of the cue that are also the trailing words
+        of prev (with at least MIN_CUE_OVERLAP characters between them),
+        or 0 if there is no such overlap
+    """
+    first = words[0]
+
+    # The leftmost position in prev where the rest of prev starts the cue
+    # gives the longest overlap
+    for start, word in enumerate(prev):
+        if word == first and words[:len(prev) - start] == prev[start:]:
+            overlap = prev[start:]
+            if sum(map(len, overlap)) + len(overlap) - 1 >= MIN_CUE_OVERLAP:
+                return len(overlap)
+            return 0  # Shorter overlaps are shorter still
+
+    return 0
+
+
+def _extract_transcripts(
+    items: List[Dict],
+    pool: Optional[ProcessPoolExecutor] = None,
+) -> List[str]:
+    """
+    Extract the transcripts of several items, in a process pool for large batches.
+
+    Args:
+        items: Video data items from Apify
+        pool: Worker pool for large batches (None extracts in this process)
+
+    Returns:
+        Transcripts in the same order as items
+    """
+    # Sending items to worker processes costs more than it saves on small batches
+    if pool is None or len(items) < PROCESS_POOL_MIN_ITEMS:
+        return [_extract_transcript(item) for item in items]
+
+    return list(pool.map(_extract_transcript, items, chunksize=4))
+
+
+def _new_process_pool() -> ProcessPoolExecutor:
+    """
+    Create a worker pool for transcript extraction.
 
-        for field in possible_fields:
-            data = item.get(field)
+    Workers are spawned rather than forked: the scraper runs while writer
+    and upload threads are active, and forking a multi-threaded process can
+    leave a child holding a lock no thread will ever release.
+    """
+    return ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
 
-            if not data:
-                continue
 
-            # Handle string data (could be plain text or SRT format)
-            if isinstance(data, str):
-                # If it's SRT format, parse it
-                if self._is_srt_format(data):
-                    return self._parse_srt(data)
-                return data.strip()
+def _write_lines(lines: List[str]):
+    """
+    Write buffered output lines to stdout in one call and empty the buffer.
 
-            # Handle list/array data
-            if isinstance(data, list):
-                transcript_parts = []
-                for subtitle in data:
-                    if isinstance(subtitle, dict):
-                        # Try different text fields
-                        text = subtitle.get("text") or subtitle.get("content") or subtitle.get("line")
-                        if text:
-                            transcript_parts.append(text)
-                    elif isinstance(subtitle, str):
-                        transcript_parts.append(subtitle)
+    Args:
+        lines: Lines to write; cleared afterwards
+    """
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+        lines.clear()
 
-                if transcript_parts:
-                    return " ".join(transcript_parts).strip()
 
-        return ""
+def _is_srt_format(text: str) -> bool:
+    """Check if text is in SRT subtitle format."""
+    # SRT format has lines like: "1\n00:00:00,000 --> 00:00:05,000\nText"
+    return "-->" in text and "\n" in text
 
-    def _is_srt_format(self, text: str) -> bool:
-        """Check if text is in SRT subtitle format."""
-        # SRT format has lines like: "1\n00:00:00,000 --> 00:00:05,000\nText"
-        return "-->" in text and "\n" in text
 
-    def _parse_srt(self, srt_text: str) -> str:
-        """Parse SRT format and extract just the text."""
-        lines = srt_text.split('\n')
-        transcript_parts = []
+def _parse_srt(srt_text: str) -> str:
+    """Parse SRT format and extract just the text."""
+    lines = srt_text.split('\n')
+    transcript_parts = []
 
-        for i, line in enumerate(lines):
-            # Skip subtitle numbers and timestamps
-            if line.strip() and not line.strip().isdigit() and "-->" not in line:
-                transcript_parts.append(line.strip())
+    for i, line in enumerate(lines):
+        # Skip subtitle numbers and timestamps
+        if line.strip() and not line.strip().isdigit() and "-->" not in line:
+            transcript_parts.append(line.strip())
 
-        return " ".join(transcript_parts)
+    return " ".join(transcript_parts)
 
 
 def test_scraper():
@@ -160,10 +658,10 @@ def test_scraper():
     videos = scraper.scrape_channel(channel_url, max_videos=3)
 
     print(f"\nFound {len(videos)} videos:")
-    for video in videos:
-        print(f"\nTitle: {video['title']}")
-        print(f"URL: {video['url']}")
-        print(f"Transcript length: {len(video['transcript'])} characters")
+    for title, url, transcript in zip(videos.titles, videos.urls, videos.transcripts):
+        print(f"\nTitle: {title}")
+        print(f"URL: {url}")
+        print(f"Transcript length: {len(transcript)} characters")
 
 
 if __name__ == "__main__":